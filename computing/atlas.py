@@ -0,0 +1,28 @@
+from pathlib import Path
+import pandas as pd
+
+# AAL116 parcellation shipped with the visualization notebooks
+AAL116_FILE = Path(__file__).resolve().parent.parent / "visualization" / "aal116.csv"
+
+# Hemisphere label of the midline vermis regions
+MIDLINE = "M"
+
+
+def load_atlas(atlas_file=AAL116_FILE):
+    """
+    Load the AAL116 atlas with node coordinates, lobes and hemispheres.
+
+    Args:
+        atlas_file (Path): Path to the atlas CSV file.
+
+    Returns:
+        pd.DataFrame: One row per node with columns Node, Name, X, Y, Z, Lobe and Hemisphere.
+        Hemisphere is "L", "R" or, for the vermis, "M".
+    """
+    atlas = pd.read_csv(atlas_file)
+    atlas = atlas.rename(columns={"name": "Name", "x": "X", "y": "Y", "z": "Z", "lobe": "Lobe", "hemi": "Hemisphere"})
+
+    # The CSV alternates L and R over the vermis regions, which lie on the midline
+    atlas.loc[atlas["Name"].str.startswith("VERMIS"), "Hemisphere"] = MIDLINE
+
+    return atlas[["Node", "Name", "X", "Y", "Z", "Lobe", "Hemisphere"]].sort_values("Node", ignore_index=True)
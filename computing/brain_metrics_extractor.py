@@ -1,4 +1,5 @@
-from computing import metrics_computator
+from computing import checkpoint, lobe_aggregator, metrics_computator, spectral_metrics
+from computing.metric_columns import GRAPH_METRICS, NODE_METRICS
 from pathlib import Path
 import logging
 import numpy as np
@@ -7,10 +8,17 @@ import pandas as pd
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Number of subjects processed between two checkpoints
+CHECKPOINT_INTERVAL = 20
 
-def extract_metrics(input_directory_path, output_directory_path):
+
+def extract_metrics(input_directory_path, output_directory_path, resume=False):
     """
     Extract global and node-level metrics from brain network files in a directory.
+
+    Progress is checkpointed every CHECKPOINT_INTERVAL subjects and a manifest is written
+    once all results, lobe metrics included, are saved. With resume=True, subjects already
+    in the checkpoint are skipped.
     """
     input_directory = Path(input_directory_path)
     output_directory = Path(output_directory_path)
@@ -18,79 +26,166 @@ def extract_metrics(input_directory_path, output_directory_path):
     if not input_directory.exists() or not input_directory.is_dir():
         logging.error(f"Directory {input_directory_path} does not exist or is not a directory.")
 
-    mat_files = list(input_directory.glob("*.mat"))
+    mat_files = sorted(input_directory.glob("*.mat"))
     if not mat_files:
         logging.warning(f"No .mat files found in directory {input_directory_path}.")
 
-    graph_metrics, node_metrics = initialize_metrics()
+    checkpoint.remove_manifest(output_directory)
+    graph_metrics, node_metrics, processed_files, failed_files = restore_metrics(output_directory, resume)
+    done_files = set(processed_files) | set(failed_files)
+    mat_files = [file for file in mat_files if file.name not in done_files]
 
-    for file in mat_files:
-        process_file(file, graph_metrics, node_metrics)
+    # Files are processed in chunks so that the spectral metrics are computed on stacked matrices
+    files_per_chunk = min(spectral_metrics.chunk_size(116), CHECKPOINT_INTERVAL)
+    for start in range(0, len(mat_files), files_per_chunk):
+        processed, failed = process_files(mat_files[start:start + files_per_chunk], graph_metrics, node_metrics)
+        processed_files.extend(processed)
+        failed_files.extend(failed)
+        checkpoint.save_checkpoint(output_directory, processed_files, failed_files, graph_metrics, node_metrics)
 
-    save_results(graph_metrics, node_metrics, output_directory)
+    outputs = save_results(graph_metrics, node_metrics, output_directory)
+    lobe_aggregator.aggregate_group(output_directory)
+    outputs += lobe_aggregator.OUTPUTS
+    checkpoint.write_manifest(output_directory, processed_files, failed_files, outputs)
+    checkpoint.remove_checkpoint(output_directory)
 
 
 def initialize_metrics():
     """
     Initialize containers for graph and node metrics.
     """
-    graph_metrics = {
-        "closeness": [],
-        "clustering": [],
-        "degree": []
-    }
-
-    node_metrics = {
-        "closeness": [[] for _ in range(116)],
-        "clustering": [[] for _ in range(116)],
-        "degree": [[] for _ in range(116)]
-    }
+    graph_metrics = {metric: [] for metric in GRAPH_METRICS}
+    node_metrics = {metric: [[] for _ in range(116)] for metric in NODE_METRICS}
 
     return graph_metrics, node_metrics
 
 
-def process_file(file, graph_metrics, node_metrics):
+def restore_metrics(directory, resume):
+    """
+    Restore the metrics containers and the processed files from the checkpoint of a group.
+
+    Without resume, or if the checkpoint is missing or does not match the current metrics,
+    any checkpoint is discarded and empty containers are returned.
+    """
+    state = checkpoint.load_checkpoint(directory) if resume else None
+
+    if state and set(state["graph_metrics"]) == set(GRAPH_METRICS) and set(state["node_metrics"]) == set(NODE_METRICS):
+        logging.info(f"Resuming {directory} from checkpoint: {len(state['processed'])} subjects already processed.")
+        return state["graph_metrics"], state["node_metrics"], state["processed"], state["failed"]
+
+    if state:
+        logging.warning(f"Checkpoint in {directory} does not match the current metrics, starting over.")
+    checkpoint.remove_checkpoint(directory)
+
+    return *initialize_metrics(), [], []
+
+
+def process_files(files, graph_metrics, node_metrics):
+    """
+    Process a chunk of files: compute the spectral metrics of all their matrices at once,
+    then the network metrics of each file, and update the metrics containers.
+
+    Returns the names of the processed files, in graph order, and of the files that failed.
+    """
+    matrices = {}
+    failed = []
+    for file in files:
+        try:
+            matrix = metrics_computator.load_and_process_matrix(file)
+            if matrix.shape != (116, 116):
+                raise ValueError(f"Expected a 116x116 matrix, found {matrix.shape[0]}x{matrix.shape[1]}.")
+            if not np.isfinite(matrix).all():
+                raise ValueError("Matrix contains non-finite values.")
+            matrices[file] = matrix
+        except Exception as exc:
+            logging.error(f"Error loading matrix from file {file.parent}/{file.name}: {exc}")
+            failed.append(file.name)
+
+    spectral = compute_spectral_metrics(matrices)
+
+    processed = []
+    for file, matrix in matrices.items():
+        if file in spectral and process_file(file, matrix, spectral[file], graph_metrics, node_metrics):
+            processed.append(file.name)
+        else:
+            failed.append(file.name)
+
+    return processed, failed
+
+
+def compute_spectral_metrics(matrices):
+    """
+    Compute the spectral metrics of a chunk of matrices with a single batched call.
+    If the batch fails, the matrices are decomposed one by one so that only the faulty ones are skipped.
+
+    Returns a dict mapping each file to its spectral metrics, without the files that failed.
+    """
+    if not matrices:
+        return {}
+
+    try:
+        spectral = spectral_metrics.compute_spectral_metrics(np.stack(list(matrices.values())))
+        return {file: {metric: values[i] for metric, values in spectral.items()} for i, file in enumerate(matrices)}
+    except Exception as exc:
+        logging.warning(f"Batched spectral metrics failed ({exc}), computing them file by file.")
+
+    results = {}
+    for file, matrix in matrices.items():
+        try:
+            spectral = spectral_metrics.compute_spectral_metrics(matrix[np.newaxis])
+            results[file] = {metric: values[0] for metric, values in spectral.items()}
+        except Exception as exc:
+            logging.error(f"Error computing spectral metrics for file {file.parent}/{file.name}: {exc}")
+
+    return results
+
+
+def process_file(file, matrix, spectral, graph_metrics, node_metrics):
     """
     Process a single file to compute metrics and update the metrics containers.
+    Returns True if the file was processed, False otherwise.
     """
     try:
         logging.info(f"Processing file: {file.parent}/{file.name}")
-        brain_network = from_matrix_to_network(file)
+        brain_network = metrics_computator.create_weighted_graph(matrix)
 
         closeness_centrality = metrics_computator.compute_closeness_centrality(brain_network)
         clustering_coefficient = metrics_computator.compute_clustering_coefficients(brain_network)
         degree_centrality = metrics_computator.compute_degree_centrality(brain_network)
+        eigenvector_centrality = dict(enumerate(spectral["eigenvector"]))
 
         # Aggregate global metrics
-        graph_metrics["closeness"].append(np.mean(list(closeness_centrality.values())))
-        graph_metrics["clustering"].append(np.mean(list(clustering_coefficient.values())))
-        graph_metrics["degree"].append(np.mean(list(degree_centrality.values())))
+        graph_values = {
+            "closeness": np.mean(list(closeness_centrality.values())),
+            "clustering": np.mean(list(clustering_coefficient.values())),
+            "degree": np.mean(list(degree_centrality.values())),
+            "algebraic_connectivity": spectral["algebraic_connectivity"],
+            "spectral_gap": spectral["spectral_gap"],
+            "energy": spectral["energy"]
+        }
+
+        # Containers are only updated once every metric is available, so they stay aligned
+        for metric, value in graph_values.items():
+            graph_metrics[metric].append(value)
 
         # Aggregate node-level metrics
         for i, node in enumerate(brain_network.nodes):
             node_metrics["closeness"][i].append(closeness_centrality[node])
             node_metrics["clustering"][i].append(clustering_coefficient[node])
             node_metrics["degree"][i].append(degree_centrality[node])
+            node_metrics["eigenvector"][i].append(eigenvector_centrality[node])
 
     except Exception as exc:
         logging.error(f"Error processing file {file.parent}/{file.name}: {exc}")
+        return False
 
-
-def from_matrix_to_network(file_path):
-    """
-    Convert a correlation matrix into a weighted network graph.
-    """
-    try:
-        matrix = metrics_computator.load_and_process_matrix(file_path)
-        return metrics_computator.create_weighted_graph(matrix)
-    except Exception as exc:
-        logging.error(f"Error converting matrix to network for file {file_path}: {exc}")
-        raise
+    return True
 
 
 def save_results(graph_metrics, node_metrics, directory):
     """
     Save metrics and statistics to CSV files.
+    Returns the paths of the saved files, relative to directory.
     """
     create_directory(directory / "metrics")
     create_directory(directory / "stats")
@@ -104,6 +199,9 @@ def save_results(graph_metrics, node_metrics, directory):
     save_graph_statistics(graph_statistics, directory / "stats" / "graph_statistics.csv")
     save_node_statistics(node_statistics, directory / "stats" / "node_statistics.csv")
 
+    return ["metrics/graph_metrics.csv", "metrics/node_metrics.csv",
+            "stats/graph_statistics.csv", "stats/node_statistics.csv"]
+
 
 def save_graph_metrics(graph_metrics, output_file):
     """
@@ -113,15 +211,12 @@ def save_graph_metrics(graph_metrics, output_file):
 
     data = []
     for graph in range(len(graph_metrics["closeness"])):
-        data.append({
-            "Graph": graph + 1,
-            "Closeness": graph_metrics["closeness"][graph],
-            "Clustering": graph_metrics["clustering"][graph],
-            "Degree": graph_metrics["degree"][graph]
-        })
+        row = {"Graph": graph + 1}
+        row.update({column: graph_metrics[metric][graph] for metric, column in GRAPH_METRICS.items()})
+        data.append(row)
 
     df = pd.DataFrame(data)
-    df.to_csv(output_file, index=False)
+    checkpoint.atomic_write_csv(df, output_file)
 
 
 def save_node_metrics(node_metrics, output_file):
@@ -133,16 +228,12 @@ def save_node_metrics(node_metrics, output_file):
     data = []
     for node in range(116):
         for graph in range(len(node_metrics["closeness"][node])):
-            data.append({
-                "Node": node + 1,
-                "Graph": graph + 1,
-                "Closeness": node_metrics["closeness"][node][graph],
-                "Clustering": node_metrics["clustering"][node][graph],
-                "Degree": node_metrics["degree"][node][graph]
-            })
+            row = {"Node": node + 1, "Graph": graph + 1}
+            row.update({column: node_metrics[metric][node][graph] for metric, column in NODE_METRICS.items()})
+            data.append(row)
 
     df = pd.DataFrame(data)
-    df.to_csv(output_file, index=False)
+    checkpoint.atomic_write_csv(df, output_file)
 
 
 def compute_graph_statistics(graph_metrics):
@@ -189,7 +280,7 @@ def save_graph_statistics(graph_statistics, output_file):
         })
 
     df = pd.DataFrame(data)
-    df.to_csv(output_file, index=False)
+    checkpoint.atomic_write_csv(df, output_file)
 
 
 def save_node_statistics(node_statistics, output_file):
@@ -210,7 +301,7 @@ def save_node_statistics(node_statistics, output_file):
             })
 
     df = pd.DataFrame(data)
-    df.to_csv(output_file, index=False)
+    checkpoint.atomic_write_csv(df, output_file)
 
 
 def create_directory(directory_path):
@@ -0,0 +1,203 @@
+from computing.metric_columns import GRAPH_METRICS, NODE_METRICS
+from datetime import datetime, timezone
+from pathlib import Path
+import json
+import logging
+import os
+import tempfile
+
+CHECKPOINT_FILE = "checkpoint.json"
+MANIFEST_FILE = "manifest.json"
+
+
+def atomic_write(output_file, write):
+    """
+    Write a file through a temporary file in the same folder, renamed over the target once complete.
+
+    A crash while writing leaves at most a stray temporary file, never a truncated output.
+
+    Args:
+        output_file (Path): Path of the file to write.
+        write (function): Function writing the content to the path it receives.
+    """
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+
+    descriptor, temporary_file = tempfile.mkstemp(dir=output_file.parent, prefix=f".{output_file.name}.", suffix=".tmp")
+    os.close(descriptor)
+    try:
+        # mkstemp creates private files, give the output the usual permissions instead
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(temporary_file, 0o666 & ~umask)
+
+        write(temporary_file)
+        with open(temporary_file, "rb") as file:
+            os.fsync(file.fileno())
+        os.replace(temporary_file, output_file)
+    except BaseException:
+        Path(temporary_file).unlink(missing_ok=True)
+        raise
+
+
+def atomic_write_csv(df, output_file):
+    """
+    Atomically save a DataFrame to a CSV file.
+    """
+    atomic_write(output_file, lambda path: df.to_csv(path, index=False))
+
+
+def atomic_write_json(data, output_file):
+    """
+    Atomically save JSON-serializable data to a file.
+    """
+    def write(path):
+        with open(path, "w") as file:
+            json.dump(data, file)
+
+    atomic_write(output_file, write)
+
+
+def read_json(input_file):
+    """
+    Read a JSON file, returning None if it does not exist or is not valid JSON.
+    """
+    try:
+        with open(input_file) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+    except json.JSONDecodeError as exc:
+        logging.warning(f"Ignoring invalid file {input_file}: {exc}")
+        return None
+
+
+def save_checkpoint(directory, processed_files, failed_files, graph_metrics, node_metrics):
+    """
+    Save the subjects processed so far and their metrics.
+
+    Args:
+        directory (Path): Output folder of the group.
+        processed_files (list): Names of the processed files, in graph order.
+        failed_files (list): Names of the files that could not be processed.
+        graph_metrics (dict): Graph metrics containers.
+        node_metrics (dict): Node metrics containers.
+    """
+    atomic_write_json({
+        "processed": processed_files,
+        "failed": failed_files,
+        "graph_metrics": graph_metrics,
+        "node_metrics": node_metrics
+    }, Path(directory) / CHECKPOINT_FILE)
+    logging.info(f"Checkpoint saved in {directory} ({len(processed_files)} subjects).")
+
+
+def load_checkpoint(directory):
+    """
+    Load the checkpoint of a group.
+
+    Returns:
+        dict: The checkpoint content, or None if there is no valid checkpoint.
+    """
+    return read_json(Path(directory) / CHECKPOINT_FILE)
+
+
+def remove_checkpoint(directory):
+    """
+    Remove the checkpoint of a group, if any.
+    """
+    (Path(directory) / CHECKPOINT_FILE).unlink(missing_ok=True)
+
+
+def write_manifest(directory, processed_files, failed_files, outputs):
+    """
+    Mark the extraction of a group as complete.
+
+    Args:
+        directory (Path): Output folder of the group.
+        processed_files (list): Names of the processed files, in graph order.
+        failed_files (list): Names of the files that could not be processed.
+        outputs (list): Paths of the written files, relative to directory.
+    """
+    atomic_write_json({
+        "completed": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "metrics": extracted_metrics(),
+        "subjects": len(processed_files),
+        "files": processed_files,
+        "failed": failed_files,
+        "outputs": outputs
+    }, Path(directory) / MANIFEST_FILE)
+
+
+def extracted_metrics():
+    """
+    Return the graph and node metrics currently produced by the extraction.
+    """
+    return {"graph": sorted(GRAPH_METRICS), "node": sorted(NODE_METRICS)}
+
+
+def read_manifest(directory):
+    """
+    Read the manifest of a group.
+
+    Returns:
+        dict: The manifest content, or None if there is no valid manifest.
+    """
+    return read_json(Path(directory) / MANIFEST_FILE)
+
+
+def remove_manifest(directory):
+    """
+    Mark the extraction of a group as incomplete.
+    """
+    (Path(directory) / MANIFEST_FILE).unlink(missing_ok=True)
+
+
+def is_complete(directory):
+    """
+    Check whether the extraction of a group completed with the current metrics and all its outputs exist.
+    """
+    directory = Path(directory)
+    manifest = read_manifest(directory)
+
+    if manifest is None or manifest.get("metrics") != extracted_metrics():
+        return False
+
+    return all((directory / output).exists() for output in manifest["outputs"])
+
+
+def group_versions(group_directories):
+    """
+    Return the completion time of the extraction of each group, None for groups not extracted.
+    """
+    versions = {}
+    for directory in group_directories:
+        manifest = read_manifest(directory) if is_complete(directory) else None
+        versions[Path(directory).name] = manifest["completed"] if manifest else None
+
+    return versions
+
+
+def write_comparison_manifest(directory, group_directories):
+    """
+    Mark the comparison of groups as complete, recording the extractions it was computed from.
+
+    Args:
+        directory (Path): Output folder of the comparison.
+        group_directories (list): Folders of the compared groups.
+    """
+    atomic_write_json({
+        "completed": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "groups": group_versions(group_directories)
+    }, Path(directory) / MANIFEST_FILE)
+
+
+def is_compared(directory, group_directories):
+    """
+    Check whether the comparison of groups completed on fully extracted groups and none of them
+    was extracted again since.
+    """
+    manifest = read_manifest(directory)
+    versions = group_versions(group_directories)
+
+    return manifest is not None and None not in versions.values() and manifest.get("groups") == versions
@@ -0,0 +1,131 @@
+from computing import atlas, checkpoint
+from pathlib import Path
+from scipy import sparse
+import logging
+import numpy as np
+import pandas as pd
+
+# Hemisphere label of the rows holding the asymmetry index (L - R) / (L + R)
+ASYMMETRY = "Asymmetry"
+
+# Files written by aggregate_group, relative to the group folder
+OUTPUTS = ["metrics/lobe_metrics.csv", "stats/lobe_statistics.csv"]
+
+
+def aggregate_group(group_directory_path, atlas_file=atlas.AAL116_FILE):
+    """
+    Aggregate the node metrics of a group by lobe and hemisphere and save metrics and statistics.
+
+    Args:
+        group_directory_path (Path): Path to the group folder containing "metrics/node_metrics.csv".
+        atlas_file (Path): Path to the AAL116 atlas CSV file.
+
+    Returns:
+        pd.DataFrame: Lobe-level metrics of every graph.
+    """
+    group_directory = Path(group_directory_path)
+    node_metrics_file = group_directory / "metrics" / "node_metrics.csv"
+
+    if not node_metrics_file.exists():
+        raise FileNotFoundError(f"Node metrics file not found in {group_directory}")
+
+    lobe_metrics = aggregate_lobes(pd.read_csv(node_metrics_file), atlas.load_atlas(atlas_file))
+    lobe_statistics = compute_lobe_statistics(lobe_metrics)
+
+    metrics_file, statistics_file = OUTPUTS
+    checkpoint.atomic_write_csv(lobe_metrics, group_directory / metrics_file)
+    checkpoint.atomic_write_csv(lobe_statistics, group_directory / statistics_file)
+    logging.info(f"Lobe metrics saved in {group_directory}.")
+
+    return lobe_metrics
+
+
+def build_membership_matrix(atlas_table):
+    """
+    Build the sparse matrix averaging node values into lobe/hemisphere regions.
+
+    Args:
+        atlas_table (pd.DataFrame): Atlas returned by atlas.load_atlas.
+
+    Returns:
+        tuple: The (n_nodes, n_regions) CSR matrix whose columns sum to one and the
+        MultiIndex of (Lobe, Hemisphere) regions matching its columns.
+    """
+    regions = atlas_table.groupby(["Lobe", "Hemisphere"])
+    codes = regions.ngroup().to_numpy()
+    sizes = regions.size()
+
+    weights = 1.0 / sizes.to_numpy()[codes]
+    membership = sparse.csr_matrix((weights, (np.arange(len(atlas_table)), codes)),
+                                   shape=(len(atlas_table), len(sizes)))
+
+    return membership, sizes.index
+
+
+def aggregate_lobes(node_metrics, atlas_table):
+    """
+    Compute lobe/hemisphere means and asymmetry indices of every metric for every graph.
+
+    All graphs and metrics are reduced at once with a single sparse product between the
+    membership matrix and the (node, graph * metric) value matrix.
+
+    Args:
+        node_metrics (pd.DataFrame): Node metrics with columns Node, Graph and one column per metric.
+        atlas_table (pd.DataFrame): Atlas returned by atlas.load_atlas.
+
+    Returns:
+        pd.DataFrame: Rows keyed by Lobe, Hemisphere ("L", "R", "M" for the midline vermis
+        or "Asymmetry") and Graph, with one column per metric.
+    """
+    metrics = [column for column in node_metrics.columns if column not in ["Node", "Graph"]]
+    graphs = np.sort(node_metrics["Graph"].unique())
+    nodes = atlas_table["Node"].to_numpy()
+
+    # Dense (node, graph, metric) cube following the atlas node order
+    cube = node_metrics.set_index(["Node", "Graph"])[metrics].reindex(
+        pd.MultiIndex.from_product([nodes, graphs], names=["Node", "Graph"]))
+    if cube.isna().to_numpy().any():
+        raise ValueError("Node metrics must contain every atlas node for every graph")
+    values = cube.to_numpy().reshape(len(nodes), len(graphs) * len(metrics))
+
+    membership, regions = build_membership_matrix(atlas_table)
+    means = np.asarray(membership.T @ values).reshape(len(regions), len(graphs), len(metrics))
+
+    # Asymmetry index of the lobes covering both hemispheres
+    position = {region: i for i, region in enumerate(regions)}
+    lobes = [lobe for lobe in regions.get_level_values("Lobe").unique()
+             if (lobe, "L") in position and (lobe, "R") in position]
+    left = means[[position[(lobe, "L")] for lobe in lobes]]
+    right = means[[position[(lobe, "R")] for lobe in lobes]]
+    total = left + right
+    asymmetry = np.divide(left - right, total, out=np.zeros_like(total), where=total != 0)
+
+    keys = list(regions) + [(lobe, ASYMMETRY) for lobe in lobes]
+    stacked = np.concatenate([means, asymmetry]).reshape(len(keys) * len(graphs), len(metrics))
+    index = pd.MultiIndex.from_tuples([(lobe, hemisphere, graph) for lobe, hemisphere in keys for graph in graphs],
+                                      names=["Lobe", "Hemisphere", "Graph"])
+
+    lobe_metrics = pd.DataFrame(stacked, index=index, columns=metrics).reset_index()
+    return lobe_metrics.sort_values("Lobe", kind="stable", ignore_index=True)
+
+
+def compute_lobe_statistics(lobe_metrics):
+    """
+    Compute statistics (mean, median, std) for lobe-level metrics.
+
+    Args:
+        lobe_metrics (pd.DataFrame): Lobe metrics returned by aggregate_lobes.
+
+    Returns:
+        pd.DataFrame: One row per lobe, hemisphere and metric.
+    """
+    keys = ["Lobe", "Hemisphere"]
+    values = lobe_metrics.melt(id_vars=keys + ["Graph"], var_name="Metric", value_name="Value")
+    values["Metric"] = values["Metric"].str.lower().str.replace(" ", "_")
+
+    statistics = values.groupby(keys + ["Metric"], sort=False)["Value"].agg(
+        Mean="mean", Median="median", **{"Standard Deviation": lambda value: value.std(ddof=0)})
+
+    order = {"L": 0, "R": 1, atlas.MIDLINE: 2, ASYMMETRY: 3}
+    return statistics.reset_index().sort_values(
+        keys, kind="stable", ignore_index=True, key=lambda column: column.map(order) if column.name == "Hemisphere" else column)
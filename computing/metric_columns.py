@@ -0,0 +1,17 @@
+# Metric names and their CSV columns.
+# This module has no heavy imports, so that manifests can be checked without loading the pipeline.
+GRAPH_METRICS = {
+    "closeness": "Closeness",
+    "clustering": "Clustering",
+    "degree": "Degree",
+    "algebraic_connectivity": "Algebraic Connectivity",
+    "spectral_gap": "Spectral Gap",
+    "energy": "Energy"
+}
+
+NODE_METRICS = {
+    "closeness": "Closeness",
+    "clustering": "Clustering",
+    "degree": "Degree",
+    "eigenvector": "Eigenvector"
+}
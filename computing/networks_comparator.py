@@ -41,26 +41,32 @@ def compare_groups(directory_path, groups, output_path=None):
 
         results[group] = {"graph_differences": graph_differences, "node_differences": node_differences}
 
+        if "lobe" in control_statistics and "lobe" in patient_statistics:
+            results[group]["lobe_differences"] = calculate_differences(control_statistics["lobe"],
+                                                                       patient_statistics["lobe"])
+
         # Save results to CSV if output_path is specified
         if output_path:
             save_path = Path(output_path) / group
             save_path.mkdir(parents=True, exist_ok=True)
             graph_differences.to_csv(save_path / "graph_differences.csv", index=False)
             node_differences.to_csv(save_path / "node_differences.csv", index=False)
+            if "lobe_differences" in results[group]:
+                results[group]["lobe_differences"].to_csv(save_path / "lobe_differences.csv", index=False)
 
     return results
 
 
 def load_statistics(directory_path, group_name):
     """
-    Load graph and node metrics for a specific group.
+    Load graph, node and, when available, lobe statistics for a specific group.
 
     Args:
         directory_path (Path): Path to the directory containing metrics files.
         group_name (str): Name of the group (e.g., "control", "pd").
 
     Returns:
-        dict: Graph and node metrics as DataFrames.
+        dict: Graph, node and lobe statistics as DataFrames.
 
     Raises:
         FileNotFoundError: If the required metrics files are not found.
@@ -68,6 +74,7 @@ def load_statistics(directory_path, group_name):
     """
     graph_metrics_file = directory_path / group_name / "stats" / "graph_statistics.csv"
     node_metrics_file = directory_path / group_name / "stats" / "node_statistics.csv"
+    lobe_metrics_file = directory_path / group_name / "stats" / "lobe_statistics.csv"
 
     # Ensure files exist
     if not graph_metrics_file.exists() or not node_metrics_file.exists():
@@ -80,12 +87,18 @@ def load_statistics(directory_path, group_name):
     if graph_metrics.empty or node_metrics.empty:
         raise ValueError(f"Metrics files are empty for group: {group_name}")
 
-    return {"graph": graph_metrics, "node": node_metrics}
+    statistics = {"graph": graph_metrics, "node": node_metrics}
+
+    # Lobe statistics are optional, older analyses do not have them
+    if lobe_metrics_file.exists():
+        statistics["lobe"] = pd.read_csv(lobe_metrics_file)
+
+    return statistics
 
 
 def calculate_differences(control_metrics, patient_metrics):
     """
-    Calculate differences for a specific metric type (graph or node) between groups.
+    Calculate differences for a specific metric type (graph, node or lobe) between groups.
 
     Args:
         control_metrics (pd.DataFrame): Metrics for the control group.
@@ -98,10 +111,19 @@ def calculate_differences(control_metrics, patient_metrics):
     if set(control_metrics.columns) != set(patient_metrics.columns):
         raise ValueError("Control and patient metrics must have the same columns")
 
+    # Rows are matched by their keys, not by position
+    keys = [column for column in ["Node", "Lobe", "Hemisphere", "Metric"] if column in control_metrics.columns]
+    control_rows = control_metrics.set_index(keys)
+    patient_rows = patient_metrics.set_index(keys)
+
+    if set(control_rows.index) != set(patient_rows.index):
+        raise ValueError(f"Control and patient metrics must have the same {', '.join(keys)} rows")
+
+    control_rows = control_rows.reindex(patient_rows.index)
     differences = patient_metrics.copy()
 
     for column in control_metrics.columns:
-        if column not in ["Node", "Metric"]:
-            differences[column] = abs(patient_metrics[column] - control_metrics[column])
+        if column not in keys:
+            differences[column] = abs(patient_rows[column].to_numpy() - control_rows[column].to_numpy())
 
     return differences
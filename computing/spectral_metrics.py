@@ -0,0 +1,83 @@
+import numpy as np
+
+# Memory budget (bytes) for the eigendecompositions of one chunk of subjects
+DEFAULT_MEMORY_LIMIT = 256 * 1024 ** 2
+
+# Float64 N x N matrices held per subject: adjacency, Laplacian, eigenvectors and LAPACK workspace
+MATRICES_PER_SUBJECT = 4
+
+
+def chunk_size(n_nodes, memory_limit=DEFAULT_MEMORY_LIMIT):
+    """
+    Compute how many subjects can be decomposed together within the memory budget.
+
+    Args:
+        n_nodes (int): Number of nodes of each network.
+        memory_limit (int): Memory budget in bytes.
+
+    Returns:
+        int: Number of subjects per chunk (at least one).
+    """
+    subject_bytes = MATRICES_PER_SUBJECT * n_nodes * n_nodes * np.dtype(np.float64).itemsize
+    return max(1, int(memory_limit // subject_bytes))
+
+
+def compute_laplacians(adjacency):
+    """
+    Compute the Laplacian L = D - A of a stack of weighted adjacency matrices.
+
+    Args:
+        adjacency (np.ndarray): Array of shape (n_subjects, N, N).
+
+    Returns:
+        np.ndarray: Laplacians of shape (n_subjects, N, N).
+    """
+    laplacians = -adjacency
+    diagonal = np.arange(adjacency.shape[-1])
+    laplacians[:, diagonal, diagonal] += adjacency.sum(axis=-1)
+    return laplacians
+
+
+def compute_spectral_metrics(adjacency, memory_limit=DEFAULT_MEMORY_LIMIT):
+    """
+    Compute spectral metrics for a stack of weighted adjacency matrices.
+
+    The eigendecompositions run on whole chunks of subjects at once, the chunk size
+    being bounded by memory_limit.
+
+    Args:
+        adjacency (np.ndarray): Symmetric adjacency matrices of shape (n_subjects, N, N).
+        memory_limit (int): Memory budget in bytes for one chunk.
+
+    Returns:
+        dict: Per-subject arrays:
+            - algebraic_connectivity: second smallest Laplacian eigenvalue, shape (n_subjects,).
+            - spectral_gap: difference between the two largest adjacency eigenvalues, shape (n_subjects,).
+            - energy: sum of the absolute adjacency eigenvalues, shape (n_subjects,).
+            - eigenvector: eigenvector centrality of every node, shape (n_subjects, N).
+    """
+    adjacency = np.asarray(adjacency, dtype=np.float64)
+    n_subjects, n_nodes, _ = adjacency.shape
+    step = chunk_size(n_nodes, memory_limit)
+
+    metrics = {
+        "algebraic_connectivity": np.empty(n_subjects),
+        "spectral_gap": np.empty(n_subjects),
+        "energy": np.empty(n_subjects),
+        "eigenvector": np.empty((n_subjects, n_nodes)),
+    }
+
+    for start in range(0, n_subjects, step):
+        chunk = slice(start, start + step)
+
+        # Eigenvalues in ascending order
+        laplacian_values = np.linalg.eigvalsh(compute_laplacians(adjacency[chunk]))
+        values, vectors = np.linalg.eigh(adjacency[chunk])
+
+        metrics["algebraic_connectivity"][chunk] = laplacian_values[:, 1]
+        metrics["spectral_gap"][chunk] = values[:, -1] - values[:, -2]
+        metrics["energy"][chunk] = np.abs(values).sum(axis=-1)
+        # The leading eigenvector of a non-negative matrix has a constant sign and unit norm
+        metrics["eigenvector"][chunk] = np.abs(vectors[:, :, -1])
+
+    return metrics
@@ -49,29 +49,37 @@ def compare_groups(directory_path, groups, output_path=None):
 
         results[group] = {"graph_differences": graph_differences, "node_differences": node_differences}
 
+        if "lobe" in control_metrics and "lobe" in patient_metrics:
+            results[group]["lobe_differences"] = calculate_significant_differences(
+                control_metrics["lobe"], patient_metrics["lobe"], "lobe"
+            )
+
         # Save results to CSV if output_path is specified
         if output_path:
             save_path = Path(output_path) / group
             save_path.mkdir(parents=True, exist_ok=True)
             graph_differences.to_csv(save_path / "graph_analysis.csv", index=False)
             node_differences.to_csv(save_path / "node_analysis.csv", index=False)
+            if "lobe_differences" in results[group]:
+                results[group]["lobe_differences"].to_csv(save_path / "lobe_analysis.csv", index=False)
 
     return results
 
 
 def load_metrics(directory_path, group_name):
     """
-    Load graph and node metrics for a specific group.
+    Load graph, node and, when available, lobe metrics for a specific group.
 
     Args:
         directory_path (Path): Path to the directory containing metrics files.
         group_name (str): Name of the group (e.g., "control", "pd").
 
     Returns:
-        dict: Graph and node metrics as DataFrames.
+        dict: Graph, node and lobe metrics as DataFrames.
     """
     graph_metrics_file = directory_path / group_name / "metrics" / "graph_metrics.csv"
     node_metrics_file = directory_path / group_name / "metrics" / "node_metrics.csv"
+    lobe_metrics_file = directory_path / group_name / "metrics" / "lobe_metrics.csv"
 
     if not graph_metrics_file.exists() or not node_metrics_file.exists():
         raise FileNotFoundError(f"Metrics file not found for group: {group_name}")
@@ -82,26 +90,50 @@ def load_metrics(directory_path, group_name):
     if graph_metrics.empty or node_metrics.empty:
         raise ValueError(f"Metrics file is empty for group: {group_name}")
 
-    return {"graph": graph_metrics, "node": node_metrics}
+    metrics = {"graph": graph_metrics, "node": node_metrics}
+
+    # Lobe metrics are optional, older analyses do not have them
+    if lobe_metrics_file.exists():
+        metrics["lobe"] = pd.read_csv(lobe_metrics_file)
+
+    return metrics
 
 
 def calculate_significant_differences(control_metrics, patient_metrics, metric_type):
     """
-    Calculate differences for a specific metric type (graph or node) between groups.
+    Calculate differences for a specific metric type (graph, node or lobe) between groups.
 
     Args:
         control_metrics (pd.DataFrame): Metrics for the control group.
         patient_metrics (pd.DataFrame): Metrics for the patient group.
-        metric_type (str): Type of metric ("graph" or "node").
+        metric_type (str): Type of metric ("graph", "node" or "lobe").
 
     Returns:
         pd.DataFrame: Differences in metrics between groups.
     """
+    if set(control_metrics.columns) != set(patient_metrics.columns):
+        raise ValueError("Control and patient metrics must have the same columns")
+
     if metric_type == "graph":
         differences = patient_metrics.copy()
         for column in control_metrics.columns:
             if column != "Graph":
                 differences[column] = verify_significant_differences(control_metrics[column], patient_metrics[column])
+    elif metric_type == "lobe":
+        keys = ["Lobe", "Hemisphere"]
+        patient_regions = dict(list(patient_metrics.groupby(keys, sort=False)))
+        control_regions = set(control_metrics.groupby(keys, sort=False).groups)
+        if control_regions != set(patient_regions):
+            raise ValueError("Control and patient metrics must have the same lobe and hemisphere regions")
+        rows = []
+        for region, region_control_metrics in control_metrics.groupby(keys, sort=False):
+            row = dict(zip(keys, region))
+            for column in control_metrics.columns:
+                if column not in keys + ["Graph"]:
+                    row[column] = verify_significant_differences(region_control_metrics[column],
+                                                                 patient_regions[region][column])
+            rows.append(row)
+        differences = pd.DataFrame(rows)
     else:
         differences = pd.DataFrame(columns=["Node", "Closeness", "Clustering", "Degree"])
         for node in range(1,117):
@@ -0,0 +1,153 @@
+from computing import atlas
+from pathlib import Path
+import logging
+import pandas as pd
+
+NODE_VIEW_FILE = "node_view.csv"
+GRAPH_QUANTILES_FILE = "graph_quantiles.csv"
+
+
+def build_visualization_dataset(analysis_directory_path, output_directory_path, atlas_file=atlas.AAL116_FILE):
+    """
+    Build the pre-joined dataset read by the visualization notebooks.
+
+    Two files are written:
+        - node_view.csv: node statistics and node differences of every age group and group,
+          merged with the atlas coordinates, lobes and hemispheres.
+        - graph_quantiles.csv: quantile summary of every graph metric distribution, ready for box plots.
+
+    Args:
+        analysis_directory_path (Path): Path to the analysis folder of a dataset (e.g., "analysis/ppmi").
+        output_directory_path (Path): Path to the folder where the files are saved.
+        atlas_file (Path): Path to the AAL116 atlas CSV file.
+
+    Returns:
+        dict: The node view and graph quantiles as DataFrames.
+    """
+    analysis_directory = Path(analysis_directory_path)
+    output_directory = Path(output_directory_path)
+
+    node_tables = []
+    graph_tables = []
+
+    for age_group in sorted(analysis_directory.iterdir()):
+        if not age_group.is_dir():
+            continue
+
+        for group in sorted(age_group.iterdir()):
+            if not group.is_dir():
+                continue
+
+            if group.name == "comparison":
+                for compared_group in sorted(group.iterdir()):
+                    if not compared_group.is_dir():
+                        continue
+                    node_tables.append(read_table(compared_group / "node_differences.csv",
+                                                  age_group.name, compared_group.name, "differences"))
+            else:
+                node_tables.append(read_table(group / "stats" / "node_statistics.csv",
+                                              age_group.name, group.name, "statistics"))
+                graph_tables.append(read_table(group / "metrics" / "graph_metrics.csv",
+                                               age_group.name, group.name))
+
+    node_tables = [table for table in node_tables if table is not None]
+    graph_tables = [table for table in graph_tables if table is not None]
+    if not node_tables or not graph_tables:
+        raise FileNotFoundError(f"No metrics found in {analysis_directory}")
+
+    node_view = join_atlas(pd.concat(node_tables, ignore_index=True), atlas.load_atlas(atlas_file))
+    graph_quantiles = compute_graph_quantiles(pd.concat(graph_tables, ignore_index=True))
+
+    output_directory.mkdir(parents=True, exist_ok=True)
+    node_view.to_csv(output_directory / NODE_VIEW_FILE, index=False)
+    graph_quantiles.to_csv(output_directory / GRAPH_QUANTILES_FILE, index=False)
+    logging.info(f"Visualization dataset saved in {output_directory}.")
+
+    return {"node_view": node_view, "graph_quantiles": graph_quantiles}
+
+
+def read_table(file_path, age_group, group, source=None):
+    """
+    Read a CSV file and tag its rows with the age group, the group and optionally the source table.
+
+    Args:
+        file_path (Path): Path to the CSV file.
+        age_group (str): Name of the age group (e.g., "60-").
+        group (str): Name of the group (e.g., "pd").
+        source (str): Optional source table ("statistics" or "differences").
+
+    Returns:
+        pd.DataFrame: The tagged table, or None if the file does not exist.
+    """
+    if not file_path.exists():
+        logging.warning(f"File {file_path} not found, skipping it.")
+        return None
+
+    table = pd.read_csv(file_path)
+    tags = {"AgeGroup": age_group, "Group": group}
+    if source:
+        tags["Source"] = source
+
+    return table.assign(**tags)[list(tags) + list(table.columns)]
+
+
+def join_atlas(node_table, atlas_table):
+    """
+    Merge node-level rows with the atlas coordinates, lobes and hemispheres.
+
+    Args:
+        node_table (pd.DataFrame): Node statistics or differences in long format.
+        atlas_table (pd.DataFrame): Atlas returned by atlas.load_atlas.
+
+    Returns:
+        pd.DataFrame: Node rows with the atlas columns inserted after "Node".
+    """
+    joined = node_table.merge(atlas_table, on="Node", how="left", validate="many_to_one")
+    tags = ["AgeGroup", "Group", "Source", "Node"]
+    atlas_columns = [column for column in atlas_table.columns if column != "Node"]
+    values = [column for column in node_table.columns if column not in tags]
+
+    return joined[tags + atlas_columns + values]
+
+
+def compute_graph_quantiles(graph_table, whisker_range=1.5):
+    """
+    Summarize the distribution of every graph metric for each age group and group.
+
+    The whiskers follow the Matplotlib box plot convention: they extend to the most extreme
+    values within whisker_range times the interquartile range from the quartiles, and never
+    fall inside the box.
+
+    Args:
+        graph_table (pd.DataFrame): Tagged graph metrics of all groups.
+        whisker_range (float): Whisker length as a multiple of the interquartile range.
+
+    Returns:
+        pd.DataFrame: One row per age group, group and metric with count, mean, quartiles, whiskers
+        and the outliers beyond the whiskers, joined by ";" in the Fliers column.
+    """
+    keys = ["AgeGroup", "Group"]
+    values = graph_table.drop(columns="Graph").melt(id_vars=keys, var_name="Metric", value_name="Value")
+    grouped = values.groupby(keys + ["Metric"], sort=False)["Value"]
+
+    first_quartile = grouped.transform("quantile", 0.25)
+    third_quartile = grouped.transform("quantile", 0.75)
+    reach = whisker_range * (third_quartile - first_quartile)
+    values["Inner"] = values["Value"].where(values["Value"].between(first_quartile - reach, third_quartile + reach))
+
+    quantiles = grouped.agg(Count="count", Mean="mean", Min="min", Max="max")
+    quantiles["Q1"] = grouped.quantile(0.25)
+    quantiles["Median"] = grouped.median()
+    quantiles["Q3"] = grouped.quantile(0.75)
+    inner = values.groupby(keys + ["Metric"], sort=False)["Inner"]
+    quantiles["WhiskerLow"] = inner.min().where(inner.min() < quantiles["Q1"], quantiles["Q1"])
+    quantiles["WhiskerHigh"] = inner.max().where(inner.max() > quantiles["Q3"], quantiles["Q3"])
+
+    whiskers = values.join(quantiles[["WhiskerLow", "WhiskerHigh"]], on=keys + ["Metric"])
+    fliers = whiskers[(whiskers["Value"] < whiskers["WhiskerLow"]) | (whiskers["Value"] > whiskers["WhiskerHigh"])]
+    quantiles["Fliers"] = fliers.groupby(keys + ["Metric"], sort=False)["Value"].agg(
+        lambda outliers: ";".join(repr(float(value)) for value in outliers))
+    quantiles["Fliers"] = quantiles["Fliers"].fillna("")
+
+    columns = ["Count", "Mean", "Min", "WhiskerLow", "Q1", "Median", "Q3", "WhiskerHigh", "Max", "Fliers"]
+    return quantiles[columns].reset_index()
@@ -7,7 +7,7 @@ import logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 # Main function that sort the needed files
-def process_csv(file_path, source):
+def process_csv(file_path, source, dataset_root="dataset"):
     try:
         # Load the data in a DataFrame
         df = pd.read_csv(file_path)
@@ -30,7 +30,7 @@ def process_csv(file_path, source):
                 age_group = get_age_group_ppmi(row['Age'])
 
             if file:
-                move_file_from_to(str(folder), f"dataset/{source}/" + age_group + "/control", file.name)
+                move_file_from_to(str(folder), f"{dataset_root}/{source}/" + age_group + "/control", file.name)
 
         for _, row in df_patient.iterrows():
             folder = find_folder_by_substring(str(row['Subject']), source)
@@ -44,14 +44,14 @@ def process_csv(file_path, source):
                 age_group = get_age_group_ppmi(row['Age'])
 
             if file and source == "abide":
-                move_file_from_to(str(folder), f"dataset/{source}/" + age_group + "/patient", file.name)
+                move_file_from_to(str(folder), f"{dataset_root}/{source}/" + age_group + "/patient", file.name)
             elif file and source == "ppmi":
                 if row["Group"] == "PD":
-                    move_file_from_to(str(folder), f"dataset/{source}/" + age_group + "/pd", file.name)
+                    move_file_from_to(str(folder), f"{dataset_root}/{source}/" + age_group + "/pd", file.name)
                 elif row["Group"] == "Prodromal":
-                    move_file_from_to(str(folder), f"dataset/{source}/" + age_group + "/prodromal", file.name)
+                    move_file_from_to(str(folder), f"{dataset_root}/{source}/" + age_group + "/prodromal", file.name)
                 elif row["Group"] == "SWEDD":
-                    move_file_from_to(str(folder), f"dataset/{source}/" + age_group + "/swedd", file.name)
+                    move_file_from_to(str(folder), f"{dataset_root}/{source}/" + age_group + "/swedd", file.name)
 
     except Exception as exc:
         logging.error(f"Error during the process of CSV file '{file_path}': {exc}")
@@ -1,72 +1,254 @@
+import argparse
 import logging
-from dataset import folders_organizer
-from computing import brain_metrics_extractor, networks_comparator, statistical_analysis
+import time
 from pathlib import Path
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+# Heavy modules (pandas, SciPy, NetworkX) are imported inside the stages that need them,
+# so that commands like "status" start instantly.
 
-path = Path()
-metadata = path / "dataset" / "metadata"
-abide_dir = path / "dataset" / "abide"
-ppmi_dir = path / "dataset" / "ppmi"
-analysis_dir = path / "analysis"
+# Groups of each dataset, the control group being the reference of the comparisons
+DATASETS = {
+    "abide": ["control", "patient"],
+    "ppmi": ["control", "pd", "prodromal", "swedd"]
+}
 
-def organize_folders():
+
+def iter_age_groups(root, datasets, age_group=None):
+    """Yields the age group folders of the selected datasets."""
+    for dataset in datasets:
+        dataset_dir = root / dataset
+        if not dataset_dir.is_dir():
+            continue
+
+        for age_group_dir in sorted(dataset_dir.iterdir()):
+            if age_group_dir.is_dir() and age_group in (None, age_group_dir.name):
+                yield age_group_dir
+
+
+def iter_groups(root, datasets, age_group=None, group=None):
+    """Yields the group folders of the selected datasets and age groups."""
+    for age_group_dir in iter_age_groups(root, datasets, age_group):
+        for group_dir in sorted(age_group_dir.iterdir()):
+            if group_dir.is_dir() and group_dir.name != "comparison" and group in (None, group_dir.name):
+                yield group_dir
+
+
+def organize_folders(dataset_root):
     """If necessary, organizes data in specific folders."""
-    if not abide_dir.exists() and not ppmi_dir.exists():
+    from dataset import folders_organizer
+
+    metadata = dataset_root / "metadata"
+    if not (dataset_root / "abide").exists() and not (dataset_root / "ppmi").exists():
         logging.info("Organizing dataset folders...")
-        folders_organizer.process_csv(metadata / "ABIDE_metadata.csv", "abide")
-        folders_organizer.process_csv(metadata / "PPMI_metadata.csv", "ppmi")
+        folders_organizer.process_csv(metadata / "ABIDE_metadata.csv", "abide", dataset_root)
+        folders_organizer.process_csv(metadata / "PPMI_metadata.csv", "ppmi", dataset_root)
     else:
         logging.info("Dataset folders are already organized.")
 
 
-def extract_all_metrics(input_dir, output_base_dir):
-    """Extracts the metrics for each group."""
-    for age_group in input_dir.iterdir():
-        if not age_group.is_dir():
-            continue
+def extract_all_metrics(dataset_root, analysis_root, datasets, age_group=None, group=None, resume=False):
+    """Extracts the metrics for each group whose extraction has not completed."""
+    from computing import brain_metrics_extractor, checkpoint
+
+    for group_dir in iter_groups(dataset_root, datasets, age_group, group):
+        output_path = analysis_root / group_dir.relative_to(dataset_root)
+        if not checkpoint.is_complete(output_path):
+            logging.info(f"Extracting metrics for {group_dir}...")
+            brain_metrics_extractor.extract_metrics(group_dir, output_path, resume)
+        else:
+            logging.info(f"Metrics for {group_dir} already extracted.")
 
-        for group in age_group.iterdir():
-            output_group = group.relative_to("dataset")
-            output_path = output_base_dir / output_group
-            if not output_path.exists():
-                logging.info(f"Extracting metrics for {group}...")
-                brain_metrics_extractor.extract_metrics(group, output_path)
-            else:
-                logging.info(f"Metrics for {group} already extracted.")
 
+def analyze_groups(analysis_root, datasets, age_group=None, comparison_folder="comparison", force=False):
+    """Compares and analyzes fully extracted groups whose comparison is missing or older than their extraction."""
+    from computing import checkpoint, networks_comparator, statistical_analysis
 
-def analyze_groups(input_dir, group_names, comparison_folder):
-    """Compares and analyzes groups."""
-    for age_group in input_dir.iterdir():
-        if not age_group.is_dir():
+    for age_group_dir in iter_age_groups(analysis_root, datasets, age_group):
+        group_names = DATASETS[age_group_dir.parent.name]
+        group_dirs = [age_group_dir / group_name for group_name in group_names]
+        comparison_path = age_group_dir / comparison_folder
+
+        incomplete = [group_dir.name for group_dir in group_dirs if not checkpoint.is_complete(group_dir)]
+        if incomplete and not force:
+            logging.warning(f"Skipping comparison for {age_group_dir}: extraction of "
+                            f"{', '.join(incomplete)} is not complete (use --force to compare anyway).")
             continue
 
-        comparison_path = age_group / comparison_folder
-        if not comparison_path.exists():
-            logging.info(f"Comparing and analyzing groups in {age_group}...")
-            networks_comparator.compare_groups(age_group, group_names, comparison_path)
-            statistical_analysis.compare_groups(age_group, group_names, comparison_path)
+        if force or not checkpoint.is_compared(comparison_path, group_dirs):
+            logging.info(f"Comparing and analyzing groups in {age_group_dir}...")
+            checkpoint.remove_manifest(comparison_path)
+            networks_comparator.compare_groups(age_group_dir, group_names, comparison_path)
+            statistical_analysis.compare_groups(age_group_dir, group_names, comparison_path)
+            checkpoint.write_comparison_manifest(comparison_path, group_dirs)
         else:
-            logging.info(f"Comparison for {age_group} already completed.")
+            logging.info(f"Comparison for {age_group_dir} already completed.")
 
 
-def main():
-    logging.info("Pipeline started.")
-    organize_folders()
+def build_visualization_datasets(analysis_root, datasets):
+    """Builds the pre-joined datasets read by the visualization notebooks."""
+    from computing import visualization_dataset
+
+    for dataset in datasets:
+        if not (analysis_root / dataset).is_dir():
+            continue
+
+        logging.info(f"Building visualization dataset for {analysis_root / dataset}...")
+        visualization_dataset.build_visualization_dataset(analysis_root / dataset,
+                                                          analysis_root / "visualization" / dataset)
+
 
-    # Compute metrics
-    extract_all_metrics(abide_dir, analysis_dir)
-    extract_all_metrics(ppmi_dir, analysis_dir)
+def extraction_status(output_path):
+    """Describes the extraction state of a group."""
+    from computing import checkpoint
 
-    # Analyze metrics
-    analyze_groups(analysis_dir / "abide", ["control", "patient"], "comparison")
-    analyze_groups(analysis_dir / "ppmi", ["control", "pd", "prodromal", "swedd"], "comparison")
+    if checkpoint.is_complete(output_path):
+        return "extracted"
+    if (output_path / checkpoint.CHECKPOINT_FILE).exists():
+        return "interrupted (resumable)"
+    return "pending"
 
+
+def comparison_status(age_group_dir):
+    """Describes the comparison state of an age group."""
+    from computing import checkpoint
+
+    group_dirs = [age_group_dir / group_name for group_name in DATASETS[age_group_dir.parent.name]]
+    if checkpoint.is_compared(age_group_dir / "comparison", group_dirs):
+        return "compared"
+    if not all(checkpoint.is_complete(group_dir) for group_dir in group_dirs):
+        return "waiting for extraction"
+    if (age_group_dir / "comparison").exists():
+        return "outdated"
+    return "pending"
+
+
+def selected_datasets(args):
+    """Returns the datasets selected on the command line."""
+    return [args.dataset] if args.dataset else list(DATASETS)
+
+
+def run_organize(args):
+    organize_folders(args.dataset_root)
+
+
+def run_extract(args):
+    datasets = selected_datasets(args)
+    extract_all_metrics(args.dataset_root, args.analysis_root, datasets, args.age_group, args.group, args.resume)
+
+
+def run_compare(args):
+    datasets = selected_datasets(args)
+    analyze_groups(args.analysis_root, datasets, args.age_group, force=args.force)
+    build_visualization_datasets(args.analysis_root, datasets)
+
+
+def run_pipeline(args):
+    logging.info("Pipeline started.")
+    run_organize(args)
+    run_extract(args)
+    run_compare(args)
     logging.info("Pipeline completed.")
 
 
+def run_status(args):
+    for dataset in selected_datasets(args):
+        for group_dir in iter_groups(args.dataset_root, [dataset], args.age_group, args.group):
+            output_path = args.analysis_root / group_dir.relative_to(args.dataset_root)
+            subjects = sum(1 for _ in group_dir.glob("*.mat"))
+            print(f"{dataset}/{group_dir.parent.name}/{group_dir.name}: {subjects} subjects, "
+                  f"{extraction_status(output_path)}")
+
+        for age_group_dir in iter_age_groups(args.analysis_root, [dataset], args.age_group):
+            print(f"{dataset}/{age_group_dir.name}/comparison: {comparison_status(age_group_dir)}")
+
+
+def run_bench(args):
+    start = time.perf_counter()
+    import numpy as np
+    import networkx  # noqa: F401
+    import pandas  # noqa: F401
+    import scipy.io  # noqa: F401
+    import scipy.stats  # noqa: F401
+    from computing import metrics_computator, spectral_metrics
+    print(f"Imports: {time.perf_counter() - start:.3f} s")
+
+    group_dir = args.dataset_root / args.dataset / args.age_group / args.group
+    files = sorted(group_dir.glob("*.mat"))[:args.subjects]
+    if not files:
+        raise SystemExit(f"No .mat files found in {group_dir}")
+
+    start = time.perf_counter()
+    matrices = [metrics_computator.load_and_process_matrix(file) for file in files]
+    print(f"Loading {len(files)} matrices: {time.perf_counter() - start:.3f} s")
+
+    start = time.perf_counter()
+    for matrix in matrices:
+        brain_network = metrics_computator.create_weighted_graph(matrix)
+        metrics_computator.compute_closeness_centrality(brain_network)
+        metrics_computator.compute_clustering_coefficients(brain_network)
+        metrics_computator.compute_degree_centrality(brain_network)
+    elapsed = time.perf_counter() - start
+    print(f"Network metrics: {elapsed:.3f} s ({elapsed / len(files):.3f} s per subject)")
+
+    start = time.perf_counter()
+    spectral_metrics.compute_spectral_metrics(np.stack(matrices))
+    elapsed = time.perf_counter() - start
+    print(f"Spectral metrics: {elapsed:.3f} s ({elapsed / len(files):.4f} s per subject)")
+
+
+def build_parser():
+    """Builds the command line parser."""
+    parser = argparse.ArgumentParser(description="Brain network analysis pipeline. "
+                                                 "Without a command, all the stages are run.")
+    parser.add_argument("--dataset-root", type=Path, default=Path("dataset"),
+                        help="folder containing metadata and the organized datasets (default: dataset)")
+    parser.add_argument("--analysis-root", type=Path, default=Path("analysis"),
+                        help="folder where the results are saved (default: analysis)")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue interrupted extractions from their last checkpoint")
+    parser.set_defaults(func=run_pipeline, dataset=None, age_group=None, group=None, force=False)
+
+    subparsers = parser.add_subparsers(title="commands")
+
+    def add_selection(subparser, group=True):
+        subparser.add_argument("--dataset", choices=list(DATASETS), help="only process this dataset")
+        subparser.add_argument("--age-group", help="only process this age group (e.g., 60_70)")
+        if group:
+            subparser.add_argument("--group", help="only process this group (e.g., pd)")
+
+    organize = subparsers.add_parser("organize", help="sort the raw files into dataset/age group/group folders")
+    organize.set_defaults(func=run_organize)
+
+    extract = subparsers.add_parser("extract", help="extract graph, node and lobe metrics")
+    add_selection(extract)
+    extract.add_argument("--resume", action="store_true", default=argparse.SUPPRESS,
+                         help="continue interrupted extractions from their last checkpoint")
+    extract.set_defaults(func=run_extract)
+
+    compare = subparsers.add_parser("compare", help="compare the groups and build the visualization datasets")
+    add_selection(compare, group=False)
+    compare.add_argument("--force", action="store_true", help="compare again even if the comparison is up to date or an extraction is incomplete")
+    compare.set_defaults(func=run_compare)
+
+    status = subparsers.add_parser("status", help="show the progress of every stage")
+    add_selection(status)
+    status.set_defaults(func=run_status)
+
+    bench = subparsers.add_parser("bench", help="time the metric computations on a sample of subjects")
+    bench.add_argument("--dataset", choices=list(DATASETS), default="ppmi")
+    bench.add_argument("--age-group", default="60_70")
+    bench.add_argument("--group", default="pd")
+    bench.add_argument("--subjects", type=int, default=10, help="number of subjects to process (default: 10)")
+    bench.set_defaults(func=run_bench)
+
+    return parser
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,80 @@
+from functools import lru_cache
+from pathlib import Path
+import pandas as pd
+
+# Folder containing the visualization dataset, one sub-folder per dataset
+VISUALIZATION_DIR = Path(__file__).resolve().parent.parent / "analysis" / "visualization"
+
+
+@lru_cache(maxsize=None)
+def read_node_view(dataset, visualization_dir=VISUALIZATION_DIR):
+    """
+    Read the pre-joined node view of a dataset (e.g., "abide" or "ppmi").
+    """
+    return pd.read_csv(Path(visualization_dir) / dataset / "node_view.csv")
+
+
+@lru_cache(maxsize=None)
+def read_graph_quantiles(dataset, visualization_dir=VISUALIZATION_DIR):
+    """
+    Read the graph metric quantile summaries of a dataset (e.g., "abide" or "ppmi").
+    """
+    quantiles = pd.read_csv(Path(visualization_dir) / dataset / "graph_quantiles.csv", dtype={"Fliers": str})
+    return quantiles.fillna({"Fliers": ""})
+
+
+def load_node_values(dataset, age_group, group, statistic="Mean", source="statistics"):
+    """
+    Select one statistic of every node metric for a group, with node coordinates.
+
+    Args:
+        dataset (str): Name of the dataset (e.g., "ppmi").
+        age_group (str): Name of the age group (e.g., "60-").
+        group (str): Name of the group (e.g., "pd").
+        statistic (str): Statistic to select ("Mean", "Median" or "Standard Deviation").
+        source (str): "statistics" for the group statistics, "differences" for the differences from controls.
+
+    Returns:
+        pd.DataFrame: One row per node with Name, X, Y, Z, Lobe, Hemisphere and one column per metric.
+    """
+    view = read_node_view(dataset)
+    rows = view[(view["AgeGroup"] == age_group) & (view["Group"] == group) & (view["Source"] == source)]
+    if rows.empty:
+        raise ValueError(f"No {source} found for {dataset}/{age_group}/{group}")
+
+    atlas_columns = ["Node", "Name", "X", "Y", "Z", "Lobe", "Hemisphere"]
+    values = rows.pivot(index="Node", columns="Metric", values=statistic)
+
+    return rows[atlas_columns].drop_duplicates("Node").set_index("Node").join(values)
+
+
+def load_box_stats(dataset, metric, group):
+    """
+    Build the Matplotlib box plot statistics of a graph metric for every age group of a group.
+
+    Args:
+        dataset (str): Name of the dataset (e.g., "ppmi").
+        metric (str): Graph metric (e.g., "Closeness").
+        group (str): Name of the group (e.g., "pd").
+
+    Returns:
+        list: One dict per age group, accepted by matplotlib.axes.Axes.bxp.
+    """
+    quantiles = read_graph_quantiles(dataset)
+    rows = quantiles[(quantiles["Metric"].str.lower() == metric.lower()) & (quantiles["Group"] == group)]
+
+    return [
+        {
+            "label": row.AgeGroup,
+            "mean": row.Mean,
+            "med": row.Median,
+            "q1": row.Q1,
+            "q3": row.Q3,
+            "whislo": row.WhiskerLow,
+            "whishi": row.WhiskerHigh,
+            "fliers": [float(value) for value in row.Fliers.split(";") if value],
+            "min": row.Min,
+            "max": row.Max,
+        }
+        for row in rows.sort_values("AgeGroup").itertuples(index=False)
+    ]